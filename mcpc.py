@@ -1,58 +1,230 @@
 #!/usr/bin/env python3
-from base64 import b64decode
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from binascii import a2b_base64
+import functools
+import itertools
 import mimetypes
+import os
+import sys
+import threading
 import traceback
 from urllib.parse import urljoin
 from pathlib import Path
-import requests
+from queue import Queue
+import aiohttp
 import argparse
+import asyncio
 import tempfile
 import json
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library if no orjson wheel is available
+    orjson = None
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+mimetypes.init()
+guess_extension = functools.lru_cache(maxsize=256)(mimetypes.guess_extension)
+
+SCALAR_EXAMPLES = {
+    "string": "",
+    "integer": 0,
+    "number": 0,
+    "boolean": False,
+}
+EXAMPLE_CACHE = {}  # Serialized schema -> serialized example, see `MCP.tool_call_arguments()`
+EXAMPLE_CACHE_SIZE = 1024
+
+
+def schema_example(schema):
+    """
+    Generate an example value from a JSON Schema.
+    """
+    type_ = schema.get("type")
+    if type_ is None:
+        any_of = schema.get("anyOf")
+        return schema_example(any_of[0]) if any_of else None
+    if type(type_) is list:
+        type_ = type_[0]
+    if type_ in SCALAR_EXAMPLES:
+        return SCALAR_EXAMPLES[type_]
+
+    if type_ == "object":
+        required = schema.get("required", ())
+        return {name if name in required else name + "?": schema_example(value)
+                for name, value in schema.get("properties", {}).items()}
+    if type_ == "array":
+        items = schema.get("items", [])
+        if type(items) is dict:
+            return [schema_example(items)]
+        return [schema_example(item) for item in items]
+    raise ValueError(f"Unsupported type: {type_}")
+
+
+class JSONRPCError(ValueError):
+    """
+    https://www.jsonrpc.org/specification#error_object
+    """
+    METHOD_NOT_FOUND = -32601
+
+    def __init__(self, error: dict):
+        super().__init__(error)
+        self.code = error.get("code")
+        self.message = error.get("message", "")
 
 
 class SSE:
-    def __init__(self, url, **kwargs):
-        self.url = url
-        r = requests.get(url, stream=True, **kwargs)
-        self.iter = r.iter_lines()
-
-    def get_line(self):
-        line = next(self.iter).split(b":", 1)
-        if len(line) == 1:
-            raise ValueError(f"Missing colon separator: {line!r}")
-        name, value = line[0], line[1].lstrip()
-        return name, value
-
-    def __next__(self):
+    """
+    https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation
+    """
+    CHUNK_SIZE = 65536
+    COMPACT_SIZE = 16 * 1024  # Only drop consumed events from the buffer once they add up to this size
+
+    def __init__(self, response: aiohttp.ClientResponse):
+        self.response = response
+        self.chunks = response.content.iter_chunked(self.CHUNK_SIZE)
+        self.buffer = bytearray()
+        self.separator = None  # Blank line ending an event, detected from the first line ending
+        self.start = 0  # Start of the next event in the buffer
+        self.scanned = 0  # The buffer up to here has already been searched for a separator
+
+    async def next_event_end(self):
+        """
+        Read chunks until the buffer holds a complete event, returning where it ends and where the next one starts.
+        """
         while True:
-            name, value = self.get_line()
-            # Skip pings
-            if name == b"" and b"ping" in value:
-                assert next(self.iter) == b""
-                continue
-
-            # Return event and data
-            if name == b"event":
-                event = value.decode("utf-8")
-                name, value = self.get_line()
-                assert name == b"data"
-                data = value.decode("utf-8")
-                assert next(self.iter) == b""
-                return event, data
+            if self.separator is None:
+                newline = self.buffer.find(b"\n", self.start)
+                if newline != -1:
+                    self.separator = b"\r\n\r\n" if self.buffer[newline - 1:newline] == b"\r" else b"\n\n"
+            if self.separator is not None:
+                # Don't search large partial events from the start again for every chunk
+                end = self.buffer.find(self.separator, max(self.start, self.scanned - len(self.separator) + 1))
+                if end != -1:
+                    return end, end + len(self.separator)
+                self.scanned = len(self.buffer)
+            self.buffer += await anext(self.chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            end, next_start = await self.next_event_end()
+            event, data = "message", []
+            start = self.start
+            with memoryview(self.buffer) as view:
+                while start < end:
+                    line_end = self.buffer.find(b"\n", start, end)
+                    if line_end == -1:
+                        line_end = end
+                    stop = line_end - 1 if self.buffer[line_end - 1] == ord("\r") else line_end
+                    colon = self.buffer.find(b":", start, stop)
+                    # Lines starting with a colon are comments, like pings
+                    if colon != start:
+                        if colon == -1:
+                            colon = value_start = stop
+                        else:
+                            value_start = colon + 1
+                            if self.buffer[value_start:value_start + 1] == b" ":
+                                value_start += 1
+                        name = view[start:colon]
+                        if name == b"event":
+                            event = bytes(view[value_start:stop]).decode("utf-8")
+                        elif name == b"data":
+                            data.append(bytes(view[value_start:stop]))
+                        name.release()
+                    start = line_end + 1
+            self.start = self.scanned = next_start
+            if self.start > self.COMPACT_SIZE:
+                del self.buffer[:self.start]
+                self.start = self.scanned = 0
+
+            # Events without data are not dispatched
+            if data:
+                return event, b"\n".join(data) if len(data) > 1 else data[0]
 
 
 class MCP:
-    def __init__(self, host: str, timeout: int = 10, verify: bool = True):
-        self.host = host
+    PAYLOAD_PREFIX = b'{"jsonrpc":"2.0",'
+    HEADERS = {"Content-Type": "application/json"}
+
+    def __init__(self, host: str, session: aiohttp.ClientSession, sse: SSE, verify: bool = True):
+        self.host = host.rstrip("/")
+        # Scheme and authority of the host, which absolute paths are resolved against
+        path_start = self.host.find("/", self.host.find("://") + 3)
+        self.origin = self.host if path_start == -1 else self.host[:path_start]
+        self.session = session
+        self.sse = sse
         self.verify = verify
-        self.sse = SSE(host + '/sse', timeout=timeout, verify=verify)
-        event, data = next(self.sse)
+        self.ssl = MCP.ssl_option(verify)
+        self.ids = itertools.count(1)
+
+    @classmethod
+    async def connect(cls, host: str, timeout: int = 10, verify: bool = True,
+                      connector: aiohttp.BaseConnector = None):
+        """
+        Open the SSE stream and initialize a session with the server. The stream is kept open until `close()` or the
+        end of an `async with` block.
+
+        All requests share one keep-alive connection pool: the SSE stream holds one connection, JSON-RPC messages reuse
+        the others. Pass a `connector` to share its pool (and DNS cache) between multiple clients.
+        """
+        session = aiohttp.ClientSession(connector=connector or aiohttp.TCPConnector(limit=4),
+                                        connector_owner=connector is None,
+                                        timeout=aiohttp.ClientTimeout(total=None,
+                                                                      sock_connect=timeout,
+                                                                      sock_read=timeout))
+        try:
+            r = await session.get(host.rstrip("/") + '/sse', ssl=cls.ssl_option(verify))
+            r.raise_for_status()
+            self = cls(host, session, SSE(r), verify=verify)
+            await self.initialize()
+        except BaseException:
+            await session.close()
+            raise
+        return self
+
+    @staticmethod
+    def ssl_option(verify: bool):
+        """
+        aiohttp before 3.9 treats `ssl=True` as an unverified context, only None means default verification.
+        """
+        return None if verify else False
+
+    async def close(self):
+        self.sse.response.close()
+        await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def initialize(self):
+        event, data = await anext(self.sse)
         assert event == "endpoint", f"Received {(event, data)}"
-        self.messages_url = urljoin(self.host, data)
+        endpoint = data.decode()
+        if endpoint.startswith("/") and not endpoint.startswith("//"):
+            self.messages_url = self.origin + endpoint  # Usually /messages/?session_id=..., skip parsing the URL
+        else:
+            self.messages_url = urljoin(self.host, endpoint)
 
         # https://spec.modelcontextprotocol.io/specification/2024-11-05/basic/lifecycle/#initialization
-        response = self.jsonrpc("initialize", {
+        response = await self.jsonrpc("initialize", {
             "protocolVersion": "2024-11-05",
             "capabilities": {
                 "roots": {
@@ -66,149 +238,187 @@ class MCP:
             }
         })
         self.server_info = response["serverInfo"]
+        self.capabilities = response.get("capabilities", {})
 
-        self.jsonrpc("notifications/initialized", notification=True)
+        await self.jsonrpc("notifications/initialized", notification=True)
 
-    def jsonrpc(self, method: str, params: dict = None, notification: bool = False) -> dict:
+    @classmethod
+    def payload(cls, method: str, params: dict = None, id: int = None) -> bytes:
         """
-        https://www.jsonrpc.org/specification
+        Serialize a request from the constant prefix, instead of building and encoding a new dict every time.
         """
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-        }
+        payload = cls.PAYLOAD_PREFIX
+        if id is not None:  # notifications are recognized by the absence of an ID
+            payload += b'"id":%d,' % id
+        payload += b'"method":' + json_dumps(method)
         if params is not None:
-            payload["params"] = params
-        if not notification:  # notifications are recognized by the absence of an ID
-            payload["id"] = 1
+            payload += b',"params":' + json_dumps(params)
+        return payload + b"}"
 
-        r = requests.post(self.messages_url, json=payload, verify=self.verify)
-        assert r.ok, r.text
-
-        if not notification:  # notifications don't have a response
+    async def read_reply(self):
+        """
+        Read the next reply from the SSE stream, skipping notifications and requests sent by the server.
+        """
+        while True:
             try:
-                event, data = next(self.sse)
-                data = json.loads(data)
+                event, data = await anext(self.sse)
+                data = json_loads(data)
             except json.JSONDecodeError as e:
                 print("JSON:", repr(data))
                 raise
-            if 'error' in data:
-                raise ValueError(data["error"])
-            if 'result' not in data:
-                raise ValueError(f"No result in {data}")
-            return data["result"]
+            if isinstance(data, list):
+                replies = [reply for reply in data if "method" not in reply]
+                if replies:
+                    return replies
+            elif "method" not in data:
+                return data
+
+    @staticmethod
+    def get_result(reply: dict):
+        if 'error' in reply:
+            raise JSONRPCError(reply["error"])
+        if 'result' not in reply:
+            raise ValueError(f"No result in {reply}")
+        return reply["result"]
+
+    async def jsonrpc(self, method: str, params: dict = None, notification: bool = False) -> dict:
+        """
+        https://www.jsonrpc.org/specification
+        """
+        id = None if notification else next(self.ids)
+        payload = self.payload(method, params, id)
+
+        async with self.session.post(self.messages_url, data=payload, headers=self.HEADERS, ssl=self.ssl) as r:
+            assert r.ok, await r.text()
+
+        if not notification:  # notifications don't have a response
+            reply = await self.read_reply()
+            if isinstance(reply, list):  # Servers may wrap replies in an array
+                reply = next((r for r in reply if r.get("id") == id), None)
+                if reply is None:
+                    raise ValueError(f"No reply with ID {id} to {method!r}")
+            return self.get_result(reply)
+
+    async def list_all(self):
+        """
+        List tools, resources (including templates) and prompts. Features the server does not declare are skipped.
+        """
+        return await self.list_tools(), await self.list_resources(), await self.list_prompts()
 
-    def list_tools(self):
+    async def list_tools(self):
         """
         https://spec.modelcontextprotocol.io/specification/2024-11-05/server/tools/#listing-tools
         """
+        if "tools" not in self.capabilities:
+            return []  # Server does not declare tools
         try:
-            return self.jsonrpc("tools/list")["tools"]
-        except ValueError as e:
-            if isinstance(e.args[0], dict) and e.args[0].get("code") == -32601:
+            return (await self.jsonrpc("tools/list"))["tools"]
+        except JSONRPCError as e:
+            if e.code == JSONRPCError.METHOD_NOT_FOUND:
                 return []  # Server does not support tools
             raise
 
-    def list_resource_templates(self):
+    async def list_resource_templates(self):
+        if "resources" not in self.capabilities:
+            return []  # Server does not declare resources
         try:
-            return self.jsonrpc("resources/templates/list")["resourceTemplates"]
-        except ValueError as e:
-            if isinstance(e.args[0], dict) and e.args[0].get("code") == -32601:
+            return (await self.jsonrpc("resources/templates/list"))["resourceTemplates"]
+        except JSONRPCError as e:
+            if e.code == JSONRPCError.METHOD_NOT_FOUND:
                 return []  # Server does not support resource templates
             raise
 
-    def list_resources(self):
+    async def list_resources(self):
         """
         https://modelcontextprotocol.io/specification/2024-11-05/server/resources#listing-resources
         """
+        if "resources" not in self.capabilities:
+            return []  # Server does not declare resources
         try:
-            return self.jsonrpc("resources/list")["resources"] + self.list_resource_templates()
-        except ValueError as e:
-            if isinstance(e.args[0], dict) and e.args[0].get("code") == -32601:
+            return (await self.jsonrpc("resources/list"))["resources"] + await self.list_resource_templates()
+        except JSONRPCError as e:
+            if e.code == JSONRPCError.METHOD_NOT_FOUND:
                 return []  # Server does not support resources
             raise
 
-    def list_prompts(self):
+    async def list_prompts(self):
         """
         https://modelcontextprotocol.io/specification/2025-03-26/server/prompts/#listing-prompts
         """
+        if "prompts" not in self.capabilities:
+            return []  # Server does not declare prompts
         try:
-            return self.jsonrpc("prompts/list")["prompts"]
-        except ValueError as e:
-            if isinstance(e.args[0], dict) and e.args[0].get("code") == -32601:
+            return (await self.jsonrpc("prompts/list"))["prompts"]
+        except JSONRPCError as e:
+            if e.code == JSONRPCError.METHOD_NOT_FOUND:
                 return []  # Server does not support resources
             raise
 
-    def call_tool(self, name, arguments):
+    async def call_tool(self, name, arguments):
         """
         https://spec.modelcontextprotocol.io/specification/2024-11-05/server/tools/#calling-tools
         """
-        return self.jsonrpc("tools/call", {
+        return (await self.jsonrpc("tools/call", {
             "name": name,
             "arguments": arguments
-        })["content"]
+        }))["content"]
 
-    def get_resource(self, uri):
+    async def get_resource(self, uri):
         """
         https://modelcontextprotocol.io/specification/2024-11-05/server/resources/#getting-resources
         """
-        return self.jsonrpc("resources/read", {
+        return (await self.jsonrpc("resources/read", {
             "uri": uri
-        })["contents"]
+        }))["contents"]
 
-    def get_prompt(self, name, arguments):
+    async def get_prompt(self, name, arguments):
         """
         https://modelcontextprotocol.io/specification/2025-03-26/server/prompts/#getting-prompts
         """
-        return self.jsonrpc("prompts/get", {
+        return (await self.jsonrpc("prompts/get", {
             "name": name,
             "arguments": arguments
-        })["messages"]
+        }))["messages"]
+
+    @staticmethod
+    def tool_call_example(schema):
+        """
+        Generate example arguments from a JSON Schema.
+        """
+        return schema_example(schema)
+
+    @staticmethod
+    def tool_call_arguments(schema) -> str:
+        """
+        Serialize example arguments from a JSON Schema, cached by the schema's serialized content. Servers built from
+        the same template often share identical schemas, even across hosts.
+        """
+        key = json_dumps(schema)
+        arguments = EXAMPLE_CACHE.get(key)
+        if arguments is None:
+            if len(EXAMPLE_CACHE) >= EXAMPLE_CACHE_SIZE:
+                del EXAMPLE_CACHE[next(iter(EXAMPLE_CACHE))]  # Evict the oldest entry
+            arguments = EXAMPLE_CACHE[key] = json_dumps(schema_example(schema)).decode()
+        return arguments
 
-    def tool_call_example(arguments, result=None):
-        if not "type" in arguments:
-            if "anyOf" in arguments:
-                return MCP.tool_call_example(arguments["anyOf"][0])
-            else:
-                return None
-        if isinstance(arguments["type"], list):
-            arguments["type"] = arguments["type"][0]
-
-        if arguments["type"] == "string":
-            result = ""
-        elif arguments["type"] == "integer" or arguments["type"] == "number":
-            result = 0
-        elif arguments["type"] == "boolean":
-            result = False
-        elif arguments["type"] == "array":
-            result = []
-            if type(arguments["items"]) is dict:
-                result.append(MCP.tool_call_example(arguments["items"]))
-            else:
-                for item in arguments["items"]:
-                    result.append(MCP.tool_call_example(item))
-        elif arguments["type"] == "object":
-            result = {}
-            if "properties" in arguments:
-                for key, value in arguments["properties"].items():
-                    if key not in arguments.get("required", []):
-                        key += "?"
-                    result[key] = MCP.tool_call_example(value)
-        else:
-            raise ValueError(f"Unsupported type: {arguments['type']}")
 
-        return result
+def save_temp_file(data: bytes, suffix: str = None) -> str:
+    """
+    Write data to a new temporary file, returning its path.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
 
 
-def get_mcp_info(host, **kwargs):
+async def get_mcp_info(host, **kwargs):
     """
     Get MCP server information.
     """
     try:
-        mcp = MCP(host, **kwargs)
-        tools = mcp.list_tools()
-        resources = mcp.list_resources()
-        prompts = mcp.list_prompts()
+        async with await MCP.connect(host, **kwargs) as mcp:
+            tools, resources, prompts = await mcp.list_all()
         return {
             "host": host,
             "server_info": mcp.server_info,
@@ -221,10 +431,219 @@ def get_mcp_info(host, **kwargs):
         return {
             "host": host,
             "success": False,
-            "error": str(e)
+            "error": str(e) or type(e).__name__
         }
 
 
+async def get_all_mcp_info(hosts, concurrency, **kwargs):
+    """
+    Get MCP server information for many hosts at once, yielding results as they complete.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    # Every connected host holds its SSE stream open while sending messages, so it needs up to 2 connections
+    async with aiohttp.TCPConnector(limit=2 * concurrency, ttl_dns_cache=300) as connector:
+        async def task(host):
+            async with semaphore:
+                return await get_mcp_info(host, connector=connector, **kwargs)
+
+        for future in asyncio.as_completed([task(host) for host in hosts]):
+            yield await future
+
+
+def render_item(i: int, line1: str, line2: str = None) -> str:
+    if line2 is None:
+        return f" {i:>3}. {line1}\n"
+    return f" {i:>3}. {line1}\n      {line2}\n"
+
+
+def render_tools(tools, raw: bool = False) -> str:
+    if raw:
+        return json_dumps(tools, indent=True).decode() + "\n"
+
+    lines = []
+    for i, tool in enumerate(tools, 1):
+        command = f"{tool['name']} '{MCP.tool_call_arguments(tool['inputSchema'])}'"
+        line1 = tool.get('description', command)
+        line2 = command if 'description' in tool else None
+        lines.append(render_item(i, line1, line2))
+    return "".join(lines)
+
+
+def render_resources(resources, raw: bool = False) -> str:
+    if raw:
+        return json_dumps(resources, indent=True).decode() + "\n"
+
+    lines = []
+    for i, resource in enumerate(resources, 1):
+        if 'uriTemplate' in resource:
+            # Dynamic resource templates (callable)
+            command = f"'{resource['uriTemplate']}'"
+            line1 = resource.get('description', command)
+            line2 = command if 'description' in resource else None
+        else:
+            # Static resources
+            if resource['name'] != resource['uri']:
+                line1 = resource['name']
+                if 'description' in resource:
+                    line1 += f" ({resource['description']})"
+                line2 = resource['uri']
+            else:
+                if 'description' in resource:
+                    line1 = resource['description']
+                    line2 = resource['uri']
+                else:
+                    line1 = resource['uri']
+                    line2 = None
+        lines.append(render_item(i, line1, line2))
+    return "".join(lines)
+
+
+def render_prompts(prompts, raw: bool = False) -> str:
+    if raw:
+        return json_dumps(prompts, indent=True).decode() + "\n"
+
+    lines = []
+    for i, prompt in enumerate(prompts, 1):
+        arguments = {
+            arg['name']: "" for arg in prompt.get('arguments', [])}
+        command = f"prompt/{prompt['name']} '{json_dumps(arguments).decode()}'"
+        line1 = prompt["description"] if prompt.get(
+            'description') else command
+        line2 = command if prompt.get("description") else None
+        lines.append(render_item(i, line1, line2))
+    return "".join(lines)
+
+
+def print_mcp_info(data, raw: bool = False):
+    """
+    Print the tools, resources and prompts of a `get_mcp_info()` result in a single write.
+    """
+    if not data["success"]:
+        output = [f"=== {data['host']} ===\n", f"Error: {data['error']}\n"]
+    else:
+        output = [
+            f"=== {data['host']} ===\n",
+            f"Name: {data['server_info']['name']!r}\n",
+            "-> Tools:\n",
+            render_tools(data["tools"], raw),
+            "-> Resources:\n",
+            render_resources(data["resources"], raw),
+            "-> Prompts:\n",
+            render_prompts(data["prompts"], raw),
+            "\n",
+        ]
+    sys.stdout.write("".join(output))
+    sys.stdout.flush()
+
+
+def print_worker(queue: Queue, raw: bool = False):
+    """
+    Print results from a queue until `None` is received, so printing does not block the event loop.
+    """
+    while (data := queue.get()) is not None:
+        try:
+            print_mcp_info(data, raw)
+        except Exception:
+            traceback.print_exc()
+
+
+async def main(args, hosts):
+    if not args.name_or_uri:
+        # List tools/resources/prompts
+        all_results = []
+        queue = Queue()
+        printer = threading.Thread(target=print_worker, args=(queue, args.raw))
+        printer.start()
+        try:
+            async for data in get_all_mcp_info(hosts, args.threads, timeout=args.timeout, verify=not args.insecure):
+                all_results.append(data)
+                queue.put(data)
+        finally:
+            queue.put(None)
+            printer.join()
+
+        if args.output:
+            args.output.write_bytes(json_dumps(all_results, indent=True))
+            print(f"Results written to {args.output}")
+    else:
+        # Call tool/prompt/resource
+        async with await MCP.connect(hosts[0], timeout=args.timeout, verify=not args.insecure) as mcp:
+            if "://" in args.name_or_uri:
+                # Fetch resource
+                result = await mcp.get_resource(args.name_or_uri)
+                if args.raw:
+                    print(json_dumps(result, indent=True).decode())
+                else:
+                    for content in result:
+                        extension = guess_extension(content["mimeType"])
+                        if 'blob' in content:
+                            path = save_temp_file(a2b_base64(content["blob"]), extension)
+                            print(f"File content saved to {path}")
+                        elif "text" in content:
+                            print(f"{content['text']}")
+                        else:
+                            raise ValueError(
+                                f"Unsupported resource: {content}")
+            elif args.name_or_uri.startswith("prompt/"):
+                # Get prompt
+                result = await mcp.get_prompt(args.name_or_uri[7:],
+                                              json_loads(args.args or "{}"))
+                if args.raw:
+                    print(json_dumps(result, indent=True).decode())
+                else:
+                    for message in result:
+                        content = message["content"]
+                        if content["type"] == "text":
+                            content_s = content["text"]
+                        elif content["type"] == "image" or content["type"] == "audio":
+                            extension = guess_extension(content["mimeType"])
+                            path = save_temp_file(a2b_base64(content["data"]), extension)
+                            content_s = f"<{path}>"
+                        elif content["type"] == "resource":
+                            resource = content["resource"]
+                            if 'text' in resource:
+                                content_s = resource["text"]
+                            elif 'blob' in resource:
+                                extension = guess_extension(resource["mimeType"])
+                                path = save_temp_file(a2b_base64(resource["blob"]), extension)
+                                content_s = f"<{path}>"
+                            else:
+                                content_s = f"<{resource['uri']}>"
+                        else:
+                            raise NotImplementedError
+                        print(f"{message['role']}: {content_s}")
+            else:
+                # Call tool
+                result = await mcp.call_tool(args.name_or_uri,
+                                             json_loads(args.args or "{}"))
+                if args.raw:
+                    print(json_dumps(result, indent=True).decode())
+                else:
+                    for content in result:
+                        if content["type"] == "text":
+                            print(content['text'])
+                        elif content["type"] == "image" or content["type"] == "audio":
+                            extension = guess_extension(content["mimeType"])
+                            path = save_temp_file(a2b_base64(content["data"]), extension)
+                            print(f"File content saved to {path}")
+                        elif content["type"] == "resource":
+                            resource = content["resource"]
+                            if 'text' in resource:
+                                print(resource["text"])
+                            elif 'blob' in resource:
+                                extension = guess_extension(resource["mimeType"])
+                                path = save_temp_file(a2b_base64(resource["blob"]), extension)
+                                print(f"Resource content saved to {path}")
+                            else:
+                                print("Resource:", resource['uri'])
+                        else:
+                            raise NotImplementedError
+
+                if args.output:
+                    args.output.write_bytes(json_dumps(result, indent=True))
+                    print(f"Result written to {args.output}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Interact with a Model Context Protocol server")
@@ -244,8 +663,8 @@ if __name__ == "__main__":
                         help="Print raw JSON response")
     parser.add_argument("-t", "--timeout", type=int, default=10,
                         help="Timeout for requests in seconds, 0 for no timeout (default: %(default)s)")
-    parser.add_argument("-T", "--threads", type=int, default=10,
-                        help="Number of threads to use for concurrent requests (default: %(default)s)")
+    parser.add_argument("-T", "--threads", type=int, default=100,
+                        help="Number of hosts to connect to concurrently (default: %(default)s)")
     parser.add_argument("-k", "--insecure", action="store_true",
                         help="Ignore SSL certificate errors")
 
@@ -257,182 +676,7 @@ if __name__ == "__main__":
         hosts = [args.host]
     hosts = ["http://" + host
              if not host.startswith("http") else host for host in hosts]
-    if args.insecure:
-        requests.packages.urllib3.disable_warnings()
     if args.timeout == 0:
         args.timeout = None
 
-    if not args.name_or_uri:
-        # List tools/resources/prompts
-        all_results = []
-        with ThreadPoolExecutor(max_workers=args.threads) as executor:
-            future_to_host = {executor.submit(get_mcp_info, host, timeout=args.timeout, verify=not args.insecure): host
-                              for host in hosts}
-
-            for future in as_completed(future_to_host):
-                host = future_to_host[future]
-                data = future.result()
-                all_results.append(data)
-                print(f"=== {host} ===")
-                if not data["success"]:
-                    print("Error:", data["error"])
-                    continue
-
-                print("Name:", repr(data["server_info"]["name"]))
-                print("-> Tools:")
-                tools = data["tools"]
-                if args.raw:
-                    print(json.dumps(tools, indent=4))
-                else:
-                    for i, tool in enumerate(tools, 1):
-                        arguments = MCP.tool_call_example(tool['inputSchema'])
-                        command = f"{tool['name']} '{json.dumps(arguments)}'"
-                        line1 = tool.get('description', command)
-                        line2 = command if 'description' in tool else None
-                        print(f" {i:>3}. {line1}")
-                        if line2 is not None:
-                            print(f"      {line2}")
-                print("-> Resources:")
-                resources = data["resources"]
-                if args.raw:
-                    print(json.dumps(resources, indent=4))
-                else:
-                    for i, resource in enumerate(resources, 1):
-                        if 'uriTemplate' in resource:
-                            # Dynamic resource templates (callable)
-                            command = f"'{resource['uriTemplate']}'"
-                            line1 = resource.get('description', command)
-                            line2 = command if 'description' in tool else None
-                        else:
-                            # Static resources
-                            if resource['name'] != resource['uri']:
-                                line1 = resource['name']
-                                if 'description' in resource:
-                                    line1 += f" ({resource['description']})"
-                                line2 = resource['uri']
-                            else:
-                                if 'description' in resource:
-                                    line1 = resource['description']
-                                    line2 = resource['uri']
-                                else:
-                                    line1 = resource['uri']
-                                    line2 = None
-
-                        print(f" {i:>3}. {line1}")
-                        if line2 is not None:
-                            print(f"      {line2}")
-                print("-> Prompts:")
-                prompts = data["prompts"]
-                if args.raw:
-                    print(json.dumps(prompts, indent=4))
-                else:
-                    for i, prompt in enumerate(prompts, 1):
-                        arguments = {
-                            arg['name']: "" for arg in prompt.get('arguments', [])}
-                        command = f"prompt/{prompt['name']} '{json.dumps(arguments)}'"
-                        line1 = prompt["description"] if prompt.get(
-                            'description') else command
-                        line2 = command if prompt.get("description") else None
-                        print(f" {i:>3}. {line1}")
-                        if line2 is not None:
-                            print(f"      {line2}")
-                print()
-
-        if args.output:
-            with args.output.open("w") as f:
-                json.dump(all_results, f, indent=4)
-            print(f"Results written to {args.output}")
-    else:
-        # Call tool/prompt/resource
-        mcp = MCP(hosts[0], timeout=args.timeout)
-        if "://" in args.name_or_uri:
-            # Fetch resource
-            result = mcp.get_resource(args.name_or_uri)
-            if args.raw:
-                print(json.dumps(result, indent=4))
-            else:
-                for content in result:
-                    extension = mimetypes.guess_extension(
-                        content["mimeType"])
-                    if 'blob' in content:
-                        with open(tempfile.mktemp(suffix=extension), "wb") as f:
-                            data = content.get(
-                                "text", b64decode(content["blob"]))
-                            f.write(b64decode(data))
-                        print(f"File content saved to {f.name}")
-                    elif "text" in content:
-                        print(f"{content['text']}")
-                    else:
-                        raise ValueError(
-                            f"Unsupported resource: {content}")
-        elif args.name_or_uri.startswith("prompt/"):
-            # Get prompt
-            result = mcp.get_prompt(args.name_or_uri[7:],
-                                    json.loads(args.args or "{}"))
-            if args.raw:
-                print(json.dumps(result, indent=4))
-            else:
-                for message in result:
-                    content = message["content"]
-                    if content["type"] == "text":
-                        content_s = content["text"]
-                    elif content["type"] == "image" or content["type"] == "audio":
-                        extension = mimetypes.guess_extension(
-                            content["mimeType"])
-                        with open(tempfile.mktemp(suffix=extension), "wb") as f:
-                            f.write(b64decode(content["data"]))
-                        content_s = f"<{f.name}>"
-                    elif content["type"] == "resource":
-                        resource = content["resource"]
-                        if 'text' in resource:
-                            content_s = resource["text"]
-                        elif 'blob' in resource:
-                            extension = mimetypes.guess_extension(
-                                resource["mimeType"])
-                            with open(tempfile.mktemp(suffix=extension), "wb") as f:
-                                data = resource.get(
-                                    "text", b64decode(resource["blob"]))
-                                f.write(b64decode(data))
-                            content_s = f"<{f.name}>"
-                        else:
-                            content_s = f"<{resource['uri']}>"
-                    else:
-                        raise NotImplementedError
-                    print(f"{message['role']}: {content_s}")
-        else:
-            # Call tool
-            result = mcp.call_tool(args.name_or_uri,
-                                   json.loads(args.args or "{}"))
-            if args.raw:
-                print(json.dumps(result, indent=4))
-            else:
-                for content in result:
-                    if content["type"] == "text":
-                        print(content['text'])
-                    elif content["type"] == "image" or content["type"] == "audio":
-                        extension = mimetypes.guess_extension(
-                            content["mimeType"])
-                        with open(tempfile.mktemp(suffix=extension), "wb") as f:
-                            f.write(b64decode(content["data"]))
-                        print(f"File content saved to {f.name}")
-                    elif content["type"] == "resource":
-                        resource = content["resource"]
-                        if 'text' in resource:
-                            print(resource["text"])
-                        elif 'blob' in resource:
-                            extension = mimetypes.guess_extension(
-                                resource["mimeType"])
-                            with open(tempfile.mktemp(suffix=extension), "wb") as f:
-                                data = resource.get(
-                                    "text", b64decode(resource["blob"]))
-                                f.write(b64decode(data))
-                            print(f"Resource content saved to {f.name}")
-                        else:
-                            print("Resource:", resource['uri'])
-                    else:
-                        raise NotImplementedError
-
-            if args.output:
-                with args.output.open("w") as f:
-                    json.dump(result, f, indent=4)
-                print(f"Result written to {args.output}")
+    asyncio.run(main(args, hosts))